@@ -1,11 +1,24 @@
 # app.py
 
-import json
-from typing import Dict
+import bisect
+from typing import Dict, Tuple, Union
+from collections.abc import Mapping
 from dataclasses import dataclass
 
+import numpy as np
+import orjson
+import pandas as pd
 import streamlit as st
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the batch kernel still runs, uncompiled
+    def njit(**_kwargs):
+        def wrap(func):
+            return func
+
+        return wrap
+
 # ─── 0. SESSION-STATE INITIALIZATION ────────────────────────────────────────────
 # Pre-seed all keys we will use in session_state to avoid AttributeError
 initial_keys = {
@@ -34,126 +47,322 @@ for key, default_value in initial_keys.items():
         st.session_state[key] = default_value
 
 # ─── Data Classes & Calculator Logic ────────────────────────────────────────────
-@dataclass
+# Shared risk thresholds: bisect_right into the parallel label/color tuples
+_THRESHOLDS = (1.5, 2.5, 3.5, 4.5)
+_LEVELS = ("VERY HIGH RISK", "HIGH RISK", "MEDIUM RISK", "LOW RISK", "VERY LOW RISK")
+_COLORS = ("⚫", "🔴", "🟠", "🟡", "🟢")
+_LEVEL_COLOR = tuple(zip(_LEVELS, _COLORS))
+
+_INTERP_THRESHOLDS = (2.0, 3.0, 4.0)
+_INTERPRETATIONS = (
+    "❌ High risk profile. Significant concerns identified.",
+    "⚠️  Moderate risk. Consider risk mitigation strategies.",
+    "✅ Good risk profile. Solid investment opportunity.",
+    "✅ Excellent risk profile. Very attractive investment.",
+)
+
+# All 8 possible recommendation blocks, pre-joined and indexed by the
+# (operational, technical, climate) below-threshold bitmask
+_RECS = tuple(
+    "\n\n".join(
+        rec
+        for bit, rec in (
+            (4, "🔧 **Operational:** Consider upgrading O&M provider or improving grid connection."),
+            (2, "⚙️  **Technical:** Review equipment selection and contractor experience."),
+            (1, "🌦️  **Climate:** Evaluate insurance options and weather risk mitigation."),
+        )
+        if idx & bit
+    )
+    or "No specific recommendations—sub-scores are all ≥ 3.0."
+    for idx in range(8)
+)
+
+
+
+@dataclass(frozen=True, slots=True)
 class RiskScores:
     operational: float
     technical: float
     climate: float
     overall: float
 
+# Canonical session-state key order for each category (matches the weight
+# arrays below); used to gather slider values in one pass
+OP_KEYS = ("grid_connection", "om_provider", "regulatory", "site_access")
+TECH_KEYS = ("panel_tech", "inverter_tech", "system_design", "installation")
+CLI_KEYS = ("weather_variability", "extreme_weather", "resource_stability")
+
+# Every session-state key this app owns; Start Over resets exactly these
+# instead of clobbering Streamlit's internal widget bookkeeping
+_OWNED_KEYS = (
+    "profile_name",
+    "profile_email",
+    "site_name",
+    "location",
+    "capacity_mw",
+    "cod_year",
+    *OP_KEYS,
+    *TECH_KEYS,
+    *CLI_KEYS,
+)
+
+# Factor weights scaled by 100 and stored as int16: the two-decimal weights
+# and 1..5 inputs are exact in integers, so scoring accumulates in integer
+# registers and only divides by the scale at presentation time
+_W_SCALE = 100
+_OP_W = np.array([30, 25, 25, 20], dtype=np.int16)
+_TECH_W = np.array([25, 25, 25, 25], dtype=np.int16)
+_CLI_W = np.array([35, 35, 30], dtype=np.int16)
+
+# Category weights (also x100): operational, technical, climate. int32 so the
+# overall accumulation (up to 500 * 100) stays in range
+_CAT_W = np.array([30, 40, 30], dtype=np.int32)
+
+# Block-diagonal factor-weight matrix (3 x 11): one matvec over the
+# concatenated inputs yields all three (scaled) category scores at once
+_W_BLOCK = np.zeros((3, 11), dtype=np.int16)
+_W_BLOCK[0, :4] = _OP_W
+_W_BLOCK[1, 4:8] = _TECH_W
+_W_BLOCK[2, 8:] = _CLI_W
+
+
+@njit(cache=True)
+def _score_kernel(op, tech, cli, op_w, tech_w, cli_w, cat_w):
+    """Score a batch of scenarios; rows are scenarios, columns are factors.
+
+    Inputs are int8 ratings and x100-scaled integer weights, so each
+    scenario accumulates exactly in integer registers; the scale is divided
+    out only when writing the (N, 4) float result of (operational,
+    technical, climate, overall) scores.
+    """
+    n = op.shape[0]
+    out = np.empty((n, 4), dtype=np.float64)
+    for i in range(n):
+        s_op = 0
+        for j in range(op_w.shape[0]):
+            s_op += op[i, j] * op_w[j]
+        s_tech = 0
+        for j in range(tech_w.shape[0]):
+            s_tech += tech[i, j] * tech_w[j]
+        s_cli = 0
+        for j in range(cli_w.shape[0]):
+            s_cli += cli[i, j] * cli_w[j]
+        out[i, 0] = s_op / 100.0
+        out[i, 1] = s_tech / 100.0
+        out[i, 2] = s_cli / 100.0
+        out[i, 3] = (
+            s_op * cat_w[0] + s_tech * cat_w[1] + s_cli * cat_w[2]
+        ) / 10000.0
+    return out
+
+
+def _as_tuple(values, keys: Tuple[str, ...]) -> Tuple[int, ...]:
+    """Normalize a factor dict or canonical-order vector to a hashable tuple."""
+    if isinstance(values, Mapping):
+        return tuple(int(values[k]) for k in keys)
+    return tuple(int(v) for v in values)
+
+
+def _score(
+    op_tuple: Tuple[int, ...],
+    tech_tuple: Tuple[int, ...],
+    cli_tuple: Tuple[int, ...],
+) -> RiskScores:
+    """Score one scenario of slider inputs given as canonical-order tuples."""
+    inputs = np.fromiter(
+        op_tuple + tech_tuple + cli_tuple, dtype=np.int16, count=11
+    )
+    sub_scaled = _W_BLOCK @ inputs
+    overall_score = int(sub_scaled @ _CAT_W) / 10000.0
+    op_score, tech_score, climate_score = (sub_scaled / 100.0).tolist()
+    return RiskScores(
+        operational=op_score,
+        technical=tech_score,
+        climate=climate_score,
+        overall=overall_score,
+    )
+
+
 class SolarRiskCalculator:
     def __init__(self):
-        # Risk category weights
-        self.weights = {
-            "operational": 0.30,
-            "technical": 0.40,
-            "climate": 0.30,
-        }
-
-        # Operational risk factor weights
-        self.operational_weights = {
-            "grid_connection": 0.30,
-            "om_provider": 0.25,
-            "regulatory": 0.25,
-            "site_access": 0.20,
-        }
-
-        # Technical risk factor weights
-        self.technical_weights = {
-            "panel_tech": 0.25,
-            "inverter_tech": 0.25,
-            "system_design": 0.25,
-            "installation": 0.25,
-        }
-
-        # Climate risk factor weights
-        self.climate_weights = {
-            "weather_variability": 0.35,
-            "extreme_weather": 0.35,
-            "resource_stability": 0.30,
-        }
+        self._op_keys = OP_KEYS
+        self._tech_keys = TECH_KEYS
+        self._cli_keys = CLI_KEYS
 
     def calculate_risk_scores(
         self,
-        operational: Dict[str, int],
-        technical: Dict[str, int],
-        climate: Dict[str, int],
+        operational: Union[Dict[str, int], np.ndarray],
+        technical: Union[Dict[str, int], np.ndarray],
+        climate: Union[Dict[str, int], np.ndarray],
     ) -> RiskScores:
-        """Calculate weighted risk scores."""
-        op_score = sum(
-            operational[f] * self.operational_weights[f] for f in operational
-        )
-        tech_score = sum(
-            technical[f] * self.technical_weights[f] for f in technical
-        )
-        climate_score = sum(
-            climate[f] * self.climate_weights[f] for f in climate
-        )
-        overall_score = (
-            op_score * self.weights["operational"]
-            + tech_score * self.weights["technical"]
-            + climate_score * self.weights["climate"]
-        )
-        return RiskScores(
-            operational=op_score,
-            technical=tech_score,
-            climate=climate_score,
-            overall=overall_score,
+        """Calculate weighted risk scores.
+
+        Each category accepts either a factor-name dict or a vector already
+        in canonical key order.
+        """
+        return _score(
+            _as_tuple(operational, self._op_keys),
+            _as_tuple(technical, self._tech_keys),
+            _as_tuple(climate, self._cli_keys),
         )
 
+    def calculate_batch(
+        self,
+        operational: np.ndarray,
+        technical: np.ndarray,
+        climate: np.ndarray,
+    ) -> np.ndarray:
+        """Score N scenarios at once for what-if sweeps.
+
+        Each argument is an (N, n_factors) array in canonical key order;
+        returns an (N, 4) array of (operational, technical, climate,
+        overall) scores.
+        """
+        op = np.ascontiguousarray(operational, dtype=np.int8)
+        tech = np.ascontiguousarray(technical, dtype=np.int8)
+        cli = np.ascontiguousarray(climate, dtype=np.int8)
+        return _score_kernel(op, tech, cli, _OP_W, _TECH_W, _CLI_W, _CAT_W)
+
     def get_risk_level(self, score: float) -> str:
         """Convert numeric score to risk level."""
-        if score >= 4.5:
-            return "VERY LOW RISK"
-        elif score >= 3.5:
-            return "LOW RISK"
-        elif score >= 2.5:
-            return "MEDIUM RISK"
-        elif score >= 1.5:
-            return "HIGH RISK"
-        else:
-            return "VERY HIGH RISK"
+        return _LEVELS[bisect.bisect_right(_THRESHOLDS, score)]
 
     def get_risk_color(self, score: float) -> str:
         """Return an emoji-based color indicator."""
-        if score >= 4.5:
-            return "🟢"
-        elif score >= 3.5:
-            return "🟡"
-        elif score >= 2.5:
-            return "🟠"
-        elif score >= 1.5:
-            return "🔴"
-        else:
-            return "⚫"
+        return _COLORS[bisect.bisect_right(_THRESHOLDS, score)]
+
+    def classify(self, score: float) -> Tuple[str, str]:
+        """Return the (level, color) pair for a score in one threshold lookup."""
+        return _LEVEL_COLOR[bisect.bisect_right(_THRESHOLDS, score)]
 
     def risk_interpretation(self, overall: float) -> str:
         """Return interpretative text based on overall score."""
-        if overall >= 4.0:
-            return "✅ Excellent risk profile. Very attractive investment."
-        elif overall >= 3.0:
-            return "✅ Good risk profile. Solid investment opportunity."
-        elif overall >= 2.0:
-            return "⚠️  Moderate risk. Consider risk mitigation strategies."
-        else:
-            return "❌ High risk profile. Significant concerns identified."
+        return _INTERPRETATIONS[bisect.bisect_right(_INTERP_THRESHOLDS, overall)]
 
     def recommendations(self, scores: RiskScores) -> str:
         """Generate simple recommendations based on sub-scores."""
-        recs = []
-        if scores.operational < 3.0:
-            recs.append(
-                "🔧 **Operational:** Consider upgrading O&M provider or improving grid connection."
-            )
-        if scores.technical < 3.0:
-            recs.append(
-                "⚙️  **Technical:** Review equipment selection and contractor experience."
-            )
-        if scores.climate < 3.0:
-            recs.append(
-                "🌦️  **Climate:** Evaluate insurance options and weather risk mitigation."
-            )
-        return "\n\n".join(recs) if recs else "No specific recommendations—sub-scores are all ≥ 3.0."
+        idx = (
+            ((scores.operational < 3.0) << 2)
+            | ((scores.technical < 3.0) << 1)
+            | (scores.climate < 3.0)
+        )
+        return _RECS[idx]
+
+
+# ─── Slider Specs ──────────────────────────────────────────────────────────────
+# Help text for each rating slider, defined once at import so every rerun
+# passes the same interned str objects to the widgets
+_HELP_GRID = """
+        5: Direct connection to major transmission  
+        4: Strong distribution network connection  
+        3: Standard grid, occasional constraints  
+        2: Weak grid, regular curtailment  
+        1: Remote/unstable grid, frequent outages
+        """
+_HELP_OM = """
+        5: Tier 1 provider (Fluence, First Solar, etc.)  
+        4: Established regional provider (5+ years)  
+        3: Mid-tier provider, decent track record  
+        2: New provider or limited solar experience  
+        1: Self-operated or unproven contractor
+        """
+_HELP_REGULATORY = """
+        5: Streamlined permitting, supportive policies  
+        4: Standard regulatory process  
+        3: Moderate bureaucracy, some delays  
+        2: Complex permitting, changing regulations  
+        1: Hostile regulatory environment
+        """
+_HELP_SITE_ACCESS = """
+        5: Easy road access, near population centers  
+        4: Good access roads, moderate distance  
+        3: Standard rural access  
+        2: Difficult terrain or remote location  
+        1: Very remote, challenging logistics
+        """
+_HELP_PANEL = """
+        5: Tier 1 proven tech (JinkoSolar, LONGi, etc.)  
+        4: Tier 1 with newer technology  
+        3: Tier 2 established manufacturer  
+        2: Tier 2 or newer technology  
+        1: Unproven manufacturer or cutting-edge tech
+        """
+_HELP_INVERTER = """
+        5: Tier 1 inverters (SMA, ABB, SolarEdge, etc.)  
+        4: Established power electronics  
+        3: Mid-tier proven technology  
+        2: Newer technology or manufacturer  
+        1: Unproven or experimental systems
+        """
+_HELP_DESIGN = """
+        5: Simple fixed-tilt ground mount  
+        4: Single-axis tracking, standard design  
+        3: Complex tracking or mounting systems  
+        2: Challenging site conditions (slopes, etc.)  
+        1: Experimental design or extreme conditions
+        """
+_HELP_INSTALLATION = """
+        5: Tier 1 EPC contractor with proven record  
+        4: Experienced regional EPC  
+        3: Standard EPC contractor  
+        2: Limited solar experience  
+        1: New contractor or self-built
+        """
+_HELP_WEATHER_VAR = """
+        5: Very stable climate (Phoenix, Las Vegas)  
+        4: Generally stable with some variation  
+        3: Moderate seasonal/yearly variation  
+        2: Significant weather variability  
+        1: Highly unpredictable climate patterns
+        """
+_HELP_EXTREME_WEATHER = """
+        5: Minimal extreme weather risk  
+        4: Occasional severe weather  
+        3: Moderate hail/wind/storm risk  
+        2: Regular extreme weather events  
+        1: High hurricane/tornado/severe hail risk
+        """
+_HELP_RESOURCE = """
+        5: Consistent solar resource over decades  
+        4: Very stable with minor variations  
+        3: Generally stable solar resource  
+        2: Some climate change impacts expected  
+        1: Significant long-term uncertainty
+        """
+
+# (label, session-state key, help text) per factor, rendered in order
+OPERATIONAL_SLIDERS = (
+    ("Grid Connection", "grid_connection", _HELP_GRID),
+    ("O&M Provider Experience", "om_provider", _HELP_OM),
+    ("Regulatory Environment", "regulatory", _HELP_REGULATORY),
+    ("Site Accessibility", "site_access", _HELP_SITE_ACCESS),
+)
+
+TECHNICAL_SLIDERS = (
+    ("Panel Technology", "panel_tech", _HELP_PANEL),
+    ("Inverter Technology", "inverter_tech", _HELP_INVERTER),
+    ("System Design Complexity", "system_design", _HELP_DESIGN),
+    ("Installation Quality", "installation", _HELP_INSTALLATION),
+)
+
+CLIMATE_SLIDERS = (
+    ("Weather Variability", "weather_variability", _HELP_WEATHER_VAR),
+    ("Extreme Weather Risk", "extreme_weather", _HELP_EXTREME_WEATHER),
+    ("Long-term Resource Stability", "resource_stability", _HELP_RESOURCE),
+)
+
+
+def _render_sliders(specs) -> None:
+    """Emit one 1-to-5 rating slider per (label, key, help) spec."""
+    for label, key, help_ in specs:
+        st.slider(
+            label,
+            min_value=1,
+            max_value=5,
+            value=st.session_state[key],
+            key=key,
+            help=help_,
+        )
 
 
 # ─── Streamlit App “Wizard” ───────────────────────────────────────────────────
@@ -165,7 +374,114 @@ st.set_page_config(
 # Updated title to include "Sunereum Solar Risk Engine"
 st.title("☀️ Sunereum Solar Risk Engine — Solar Site Risk Calculator")
 
-calculator = SolarRiskCalculator()
+
+@dataclass
+class ResultsBundle:
+    """Every precomputed string the Results page renders, in
+    operational/technical/climate/overall order."""
+    scores: RiskScores
+    score_strs: Tuple[str, str, str, str]
+    levels: Tuple[str, str, str, str]
+    colors: Tuple[str, str, str, str]
+    interpretation: str
+    recommendations: str
+
+
+@st.cache_data
+def _results_data(
+    op_tup: Tuple[int, ...],
+    tech_tup: Tuple[int, ...],
+    cli_tup: Tuple[int, ...],
+) -> Tuple[tuple, tuple, tuple, tuple, str, str]:
+    """Score one set of slider tuples and precompute every Results-page label.
+
+    st.cache_data pickles the return value across runs, so this returns
+    only tuples of primitives — never instances of script-defined classes,
+    whose class objects differ between script runs.
+    """
+    calc = SolarRiskCalculator()
+    scores = calc.calculate_risk_scores(op_tup, tech_tup, cli_tup)
+    ordered = (scores.operational, scores.technical, scores.climate, scores.overall)
+    levels, colors = zip(*(calc.classify(s) for s in ordered))
+    return (
+        ordered,
+        tuple(f"{s:.2f}" for s in ordered),
+        levels,
+        colors,
+        calc.risk_interpretation(scores.overall),
+        calc.recommendations(scores),
+    )
+
+
+def compute_results(
+    op_tup: Tuple[int, ...],
+    tech_tup: Tuple[int, ...],
+    cli_tup: Tuple[int, ...],
+) -> ResultsBundle:
+    """Build the ResultsBundle from the cached per-input label data.
+
+    Only the bundle assembly runs on a cache hit; it uses the current
+    run's classes, so the cache never has to serialize them.
+    """
+    ordered, score_strs, levels, colors, interpretation, recommendations = (
+        _results_data(op_tup, tech_tup, cli_tup)
+    )
+    return ResultsBundle(
+        scores=RiskScores(*ordered),
+        score_strs=score_strs,
+        levels=levels,
+        colors=colors,
+        interpretation=interpretation,
+        recommendations=recommendations,
+    )
+
+
+# Map whitespace and filesystem-hostile characters to underscores in one
+# C-level pass, however many slug rules we accumulate
+_SLUG_TABLE = str.maketrans(dict.fromkeys(" \t/\\:*?\"<>|", "_"))
+
+
+@st.cache_data
+def _safe_filename(site_name: str) -> str:
+    """Build the export filename once per unique site name."""
+    return f"{site_name.translate(_SLUG_TABLE)}_risk_assessment.json"
+
+
+@st.cache_data
+def _build_json(
+    name: str,
+    email: str,
+    site_name: str,
+    location: str,
+    capacity_mw: float,
+    cod_year: int,
+    scores_tup: Tuple[float, float, float, float],
+) -> bytes:
+    """Serialize the results payload once per unique set of inputs."""
+    calc = SolarRiskCalculator()
+    op, tech, cli, overall = scores_tup
+    payload = {
+        "user": {"name": name, "email": email},
+        "site_info": {
+            "site_name": site_name,
+            "location": location,
+            "capacity_mw": capacity_mw,
+            "cod_year": cod_year,
+        },
+        "risk_scores": {
+            "operational": op,
+            "technical": tech,
+            "climate": cli,
+            "overall": overall,
+        },
+        "risk_levels": {
+            "operational": calc.get_risk_level(op),
+            "technical": calc.get_risk_level(tech),
+            "climate": calc.get_risk_level(cli),
+            "overall": calc.get_risk_level(overall),
+        },
+    }
+    return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
 
 # Show progress indicator
 total_steps = 6  # Profile, Site, Operational, Technical, Climate, Results
@@ -177,8 +493,17 @@ def _go_to_next():
     st.session_state.step += 1
 
 
+def _restart():
+    """Reset only the keys we own and jump back to the first step."""
+    for k in _OWNED_KEYS:
+        st.session_state.pop(k, None)
+    st.session_state.pop("_last_fp", None)
+    st.session_state.pop("_last_bundle", None)
+    st.session_state.step = 0
+
+
 # ───— Step 0: Profile (Name & Email) ───────────────────────────────────────────
-if st.session_state.step == 0:
+def step0_profile() -> None:
     st.header("👤 1. User Profile")
     st.markdown("Enter your name and email. You cannot proceed until both are filled.")
 
@@ -194,7 +519,7 @@ if st.session_state.step == 0:
 
 
 # ───— Step 1: Site Information ────────────────────────────────────────────────
-elif st.session_state.step == 1:
+def step1_site() -> None:
     st.header("🏷️ 2. Site Information")
     st.markdown("Provide basic details about the solar site. “Site Name” and “Location” are required.")
 
@@ -223,191 +548,40 @@ elif st.session_state.step == 1:
 
 
 # ───— Step 2: Operational Risk Factors ─────────────────────────────────────────
-elif st.session_state.step == 2:
+def step2_operational() -> None:
     st.header("⚙️ 3. Operational Risk Factors")
     st.markdown("Rate each factor from 1 (worst) to 5 (best). Once you’re satisfied, click Next.")
 
-    st.slider(
-        "Grid Connection",
-        min_value=1,
-        max_value=5,
-        value=st.session_state["grid_connection"],
-        key="grid_connection",
-        help="""
-        5: Direct connection to major transmission  
-        4: Strong distribution network connection  
-        3: Standard grid, occasional constraints  
-        2: Weak grid, regular curtailment  
-        1: Remote/unstable grid, frequent outages
-        """,
-    )
-    st.slider(
-        "O&M Provider Experience",
-        min_value=1,
-        max_value=5,
-        value=st.session_state["om_provider"],
-        key="om_provider",
-        help="""
-        5: Tier 1 provider (Fluence, First Solar, etc.)  
-        4: Established regional provider (5+ years)  
-        3: Mid-tier provider, decent track record  
-        2: New provider or limited solar experience  
-        1: Self-operated or unproven contractor
-        """,
-    )
-    st.slider(
-        "Regulatory Environment",
-        min_value=1,
-        max_value=5,
-        value=st.session_state["regulatory"],
-        key="regulatory",
-        help="""
-        5: Streamlined permitting, supportive policies  
-        4: Standard regulatory process  
-        3: Moderate bureaucracy, some delays  
-        2: Complex permitting, changing regulations  
-        1: Hostile regulatory environment
-        """,
-    )
-    st.slider(
-        "Site Accessibility",
-        min_value=1,
-        max_value=5,
-        value=st.session_state["site_access"],
-        key="site_access",
-        help="""
-        5: Easy road access, near population centers  
-        4: Good access roads, moderate distance  
-        3: Standard rural access  
-        2: Difficult terrain or remote location  
-        1: Very remote, challenging logistics
-        """,
-    )
+    _render_sliders(OPERATIONAL_SLIDERS)
 
     if st.button("Next ➡️", key="next_operational"):
         _go_to_next()
 
 
 # ───— Step 3: Technical Risk Factors ──────────────────────────────────────────
-elif st.session_state.step == 3:
+def step3_technical() -> None:
     st.header("🔧 4. Technical Risk Factors")
     st.markdown("Rate each factor from 1 (worst) to 5 (best). When ready, click Next.")
 
-    st.slider(
-        "Panel Technology",
-        min_value=1,
-        max_value=5,
-        value=st.session_state["panel_tech"],
-        key="panel_tech",
-        help="""
-        5: Tier 1 proven tech (JinkoSolar, LONGi, etc.)  
-        4: Tier 1 with newer technology  
-        3: Tier 2 established manufacturer  
-        2: Tier 2 or newer technology  
-        1: Unproven manufacturer or cutting-edge tech
-        """,
-    )
-    st.slider(
-        "Inverter Technology",
-        min_value=1,
-        max_value=5,
-        value=st.session_state["inverter_tech"],
-        key="inverter_tech",
-        help="""
-        5: Tier 1 inverters (SMA, ABB, SolarEdge, etc.)  
-        4: Established power electronics  
-        3: Mid-tier proven technology  
-        2: Newer technology or manufacturer  
-        1: Unproven or experimental systems
-        """,
-    )
-    st.slider(
-        "System Design Complexity",
-        min_value=1,
-        max_value=5,
-        value=st.session_state["system_design"],
-        key="system_design",
-        help="""
-        5: Simple fixed-tilt ground mount  
-        4: Single-axis tracking, standard design  
-        3: Complex tracking or mounting systems  
-        2: Challenging site conditions (slopes, etc.)  
-        1: Experimental design or extreme conditions
-        """,
-    )
-    st.slider(
-        "Installation Quality",
-        min_value=1,
-        max_value=5,
-        value=st.session_state["installation"],
-        key="installation",
-        help="""
-        5: Tier 1 EPC contractor with proven record  
-        4: Experienced regional EPC  
-        3: Standard EPC contractor  
-        2: Limited solar experience  
-        1: New contractor or self-built
-        """,
-    )
+    _render_sliders(TECHNICAL_SLIDERS)
 
     if st.button("Next ➡️", key="next_technical"):
         _go_to_next()
 
 
 # ───— Step 4: Climate Risk Factors ─────────────────────────────────────────────
-elif st.session_state.step == 4:
+def step4_climate() -> None:
     st.header("🌦️ 5. Climate Risk Factors")
     st.markdown("Rate each factor from 1 (worst) to 5 (best). Then click Next.")
 
-    st.slider(
-        "Weather Variability",
-        min_value=1,
-        max_value=5,
-        value=st.session_state["weather_variability"],
-        key="weather_variability",
-        help="""
-        5: Very stable climate (Phoenix, Las Vegas)  
-        4: Generally stable with some variation  
-        3: Moderate seasonal/yearly variation  
-        2: Significant weather variability  
-        1: Highly unpredictable climate patterns
-        """,
-    )
-    st.slider(
-        "Extreme Weather Risk",
-        min_value=1,
-        max_value=5,
-        value=st.session_state["extreme_weather"],
-        key="extreme_weather",
-        help="""
-        5: Minimal extreme weather risk  
-        4: Occasional severe weather  
-        3: Moderate hail/wind/storm risk  
-        2: Regular extreme weather events  
-        1: High hurricane/tornado/severe hail risk
-        """,
-    )
-    st.slider(
-        "Long-term Resource Stability",
-        min_value=1,
-        max_value=5,
-        value=st.session_state["resource_stability"],
-        key="resource_stability",
-        help="""
-        5: Consistent solar resource over decades  
-        4: Very stable with minor variations  
-        3: Generally stable solar resource  
-        2: Some climate change impacts expected  
-        1: Significant long-term uncertainty
-        """,
-    )
+    _render_sliders(CLIMATE_SLIDERS)
 
     if st.button("Next ➡️", key="next_climate"):
         _go_to_next()
 
 
 # ───— Step 5: Results ──────────────────────────────────────────────────────────
-elif st.session_state.step == 5:
+def step5_results() -> None:
     st.header("📊 6. Risk Assessment Results")
 
     # Safely fetch everything from session_state (never missing now)
@@ -434,35 +608,22 @@ elif st.session_state.step == 5:
             "🚫 Some required fields are missing. Please start over and fill every step correctly."
         )
         st.write("Missing fields:", ", ".join(missing))
-        if st.button("🔄 Start Over", key="restart_missing"):
-            for k in list(st.session_state.keys()):
-                del st.session_state[k]
-            st.session_state.step = 0
-            st.experimental_rerun()
+        st.button("🔄 Start Over", key="restart_missing", on_click=_restart)
     else:
-        # Build dictionaries (all slider keys exist now)
-        operational_inputs = {
-            "grid_connection": st.session_state["grid_connection"],
-            "om_provider": st.session_state["om_provider"],
-            "regulatory": st.session_state["regulatory"],
-            "site_access": st.session_state["site_access"],
-        }
-        technical_inputs = {
-            "panel_tech": st.session_state["panel_tech"],
-            "inverter_tech": st.session_state["inverter_tech"],
-            "system_design": st.session_state["system_design"],
-            "installation": st.session_state["installation"],
-        }
-        climate_inputs = {
-            "weather_variability": st.session_state["weather_variability"],
-            "extreme_weather": st.session_state["extreme_weather"],
-            "resource_stability": st.session_state["resource_stability"],
-        }
-
-        # Compute risk scores
-        scores = calculator.calculate_risk_scores(
-            operational_inputs, technical_inputs, climate_inputs
+        # Gather slider values straight into hashable tuples in canonical
+        # key order (all keys exist now). A plain tuple-equality check
+        # against the last fingerprint short-circuits even the cache-key
+        # hashing on "nothing changed" reruns.
+        fp = (
+            tuple(int(st.session_state[k]) for k in OP_KEYS),
+            tuple(int(st.session_state[k]) for k in TECH_KEYS),
+            tuple(int(st.session_state[k]) for k in CLI_KEYS),
         )
+        if st.session_state.get("_last_fp") != fp:
+            st.session_state["_last_bundle"] = compute_results(*fp)
+            st.session_state["_last_fp"] = fp
+        bundle = st.session_state["_last_bundle"]
+        scores = bundle.scores
 
         # Display user & site info
         st.subheader("📝 User & Site Info")
@@ -476,77 +637,60 @@ elif st.session_state.step == 5:
         st.markdown("---")
         st.subheader("📈 Risk Scores")
 
-        # Four columns: Category, Score, Level, Indicator
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.markdown("**Category**")
-            st.markdown("Operational")
-            st.markdown("Technical")
-            st.markdown("Climate")
-            st.markdown("Overall")
-        with col2:
-            st.markdown("**Score**")
-            st.markdown(f"{scores.operational:.2f}")
-            st.markdown(f"{scores.technical:.2f}")
-            st.markdown(f"{scores.climate:.2f}")
-            st.markdown(f"{scores.overall:.2f}")
-        with col3:
-            st.markdown("**Level**")
-            st.markdown(calculator.get_risk_level(scores.operational))
-            st.markdown(calculator.get_risk_level(scores.technical))
-            st.markdown(calculator.get_risk_level(scores.climate))
-            st.markdown(calculator.get_risk_level(scores.overall))
-        with col4:
-            st.markdown("**Indicator**")
-            st.markdown(calculator.get_risk_color(scores.operational))
-            st.markdown(calculator.get_risk_color(scores.technical))
-            st.markdown(calculator.get_risk_color(scores.climate))
-            st.markdown(calculator.get_risk_color(scores.overall))
+        # One table render instead of 16 individual markdown calls
+        st.table(
+            pd.DataFrame(
+                {
+                    "Category": ["Operational", "Technical", "Climate", "Overall"],
+                    "Score": list(bundle.score_strs),
+                    "Level": list(bundle.levels),
+                    "Indicator": list(bundle.colors),
+                }
+            )
+        )
 
         st.markdown("---")
         st.subheader("🔍 Interpretation")
-        st.markdown(calculator.risk_interpretation(scores.overall))
+        st.markdown(bundle.interpretation)
 
         st.markdown("---")
         st.subheader("🛠️ Recommendations")
-        st.markdown(calculator.recommendations(scores), unsafe_allow_html=True)
+        st.markdown(bundle.recommendations, unsafe_allow_html=True)
 
         st.markdown("---")
         st.subheader("💾 Export to JSON")
-        filename = f"{site_name.replace(' ', '_')}_risk_assessment.json"
-        payload = {
-            "user": {"name": name, "email": email},
-            "site_info": {
-                "site_name": site_name,
-                "location": location,
-                "capacity_mw": capacity_mw,
-                "cod_year": cod_year,
-            },
-            "risk_scores": {
-                "operational": scores.operational,
-                "technical": scores.technical,
-                "climate": scores.climate,
-                "overall": scores.overall,
-            },
-            "risk_levels": {
-                "operational": calculator.get_risk_level(scores.operational),
-                "technical": calculator.get_risk_level(scores.technical),
-                "climate": calculator.get_risk_level(scores.climate),
-                "overall": calculator.get_risk_level(scores.overall),
-            },
-        }
-        json_str = json.dumps(payload, indent=2)
+        filename = _safe_filename(site_name)
+        json_bytes = _build_json(
+            name,
+            email,
+            site_name,
+            location,
+            capacity_mw,
+            cod_year,
+            (scores.operational, scores.technical, scores.climate, scores.overall),
+        )
         st.download_button(
             label="⬇️ Download Results as JSON",
-            data=json_str,
+            data=json_bytes,
             file_name=filename,
             mime="application/json",
             key="download_json",
         )
 
-        # “Start Over” button to reset everything
-        if st.button("🔄 Start Over", key="restart"):
-            for k in list(st.session_state.keys()):
-                del st.session_state[k]
-            st.session_state.step = 0
-            st.experimental_rerun()
+        # “Start Over” button to reset everything we own; as an on_click
+        # callback the reset runs before the click's rerun renders, so the
+        # user lands on step 0 immediately
+        st.button("🔄 Start Over", key="restart", on_click=_restart)
+
+
+# O(1) dispatch on the current step instead of an if/elif chain
+_STEPS = (
+    step0_profile,
+    step1_site,
+    step2_operational,
+    step3_technical,
+    step4_climate,
+    step5_results,
+)
+
+_STEPS[st.session_state.step]()